@@ -65,6 +65,22 @@ lang_list = on_alconna(
     block=True,
 )
 
+_LANG_LIST = "Language List:\n" + "\n".join(lang_data)
+"""语言列表回复，语言数据在运行期间不会变化"""
+
+_PROMPTS: dict[str, dict[str, Text]] = {}
+"""提示消息缓存，键为语言"""
+
+
+def _say(key: str) -> Text:
+    """获取当前语言的提示消息，首次使用时生成并缓存。"""
+    if (prompts := _PROMPTS.get(lang)) is None:
+        prompts = _PROMPTS[lang] = {
+            key: Text(lang_data[lang][key]) for key in ("where_ip", "where_port")
+        }
+    return prompts[key]
+
+
 @check.handle()
 async def _(host: Match[str]):
     if host.available:
@@ -73,15 +89,15 @@ async def _(host: Match[str]):
 
 @check.got_path("host", prompt=lang_data[lang]["where_ip"])
 async def handle_check(host: str):
-    address, port = await parse_host(host)
+    address, port = parse_host(host)
 
     if not str(port).isdigit() or not (0 <= int(port) <= 65535):
-        await check.finish(Text(f'{lang_data[lang]["where_port"]}'), reply_to=True)
+        await check.finish(_say("where_port"), reply_to=True)
 
-    if await is_validity_address(address):
+    if is_validity_address(address):
         await get_info(address, port)
         return
-    await check.finish(Text(f'{lang_data[lang]["where_ip"]}'), reply_to=True)
+    await check.finish(_say("where_ip"), reply_to=True)
 
 async def get_info(ip, port):
     global ms
@@ -109,5 +125,4 @@ async def _():
 
 @lang_list.handle()
 async def _():
-    i = "\n".join(list(lang_data.keys()))
-    await lang_list.send(Text(f"Language List:\n{i}"), reply_to=True)
+    await lang_list.send(Text(_LANG_LIST), reply_to=True)
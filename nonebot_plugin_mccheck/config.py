@@ -8,6 +8,8 @@ class ScopedConfig(BaseModel):
     """插件渲染图片所使用的语言"""
     type: int = Field(default=0)
     """插件发送的消息类型"""
+    disable_srv: bool = Field(default=False)
+    """是否跳过 SRV 记录解析"""
 
 
 class Config(BaseModel):
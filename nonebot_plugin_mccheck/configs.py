@@ -3,10 +3,12 @@ import os
 import ujson
 
 def readInfo(file: str) -> dict:
-    with open(os.path.join(os.path.dirname(__file__), file), "r", encoding="utf-8") as f:
-        return ujson.loads((f.read()).strip())
+    with open(os.path.join(os.path.dirname(__file__), file), "rb") as f:
+        return ujson.loads(f.read())
 
 message_type = plugin_config.type
+disable_srv = plugin_config.disable_srv
 lang = plugin_config.language
 lang_data = readInfo("language.json")
+current_strings: dict[str, str] = lang_data[lang]
 VERSION = "0.1.46"
\ No newline at end of file
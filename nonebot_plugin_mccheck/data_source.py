@@ -18,6 +18,9 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 import base64
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import Enum
 import io
 import json
@@ -27,6 +30,81 @@ import socket
 import struct
 from time import perf_counter, time
 
+try:
+    # orjson parses UTF-8 bytes directly and is noticeably faster on large
+    # status responses (favicons are embedded as base64), use it if installed.
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Precompiled struct formats for the wire formats used below
+_INT16_BE = struct.Struct(">h")
+_UINT16_BE = struct.Struct(">H")
+_INT32_BE = struct.Struct(">i")
+_INT64_LE = struct.Struct("<q")
+_LEGACY_HDR = struct.Struct(">xh")
+"""kick packet header: packet id (skipped) and payload length in characters"""
+
+# Constant request prefixes of the TCP Server List Ping variants
+_JSON_HANDSHAKE_PREFIX = b"\x00\xff\xff\xff\xff\x0f"
+"""Handshake packet id 0x00 followed by protocol version `-1` as varint"""
+_PING_HOST_PREFIX = b"\xfe\x01\xfa\x00\x0b" + "MC|PingHost".encode("utf-16-be")
+"""0xFE ping, 0x01 payload, 0xFA plugin message and the 'MC|PingHost' channel"""
+
+_RAKNET_MAGIC = bytes.fromhex("00ffff00fefefefefdfdfdfd12345678")
+"""RakNet offline message magic, sent in and expected back from unconnected pings"""
+
+# Query protocol packet parts
+_Q_MAGIC = b"\xfe\xfd"
+"""padding that is prefixed to every packet"""
+_Q_HANDSHAKE_TYPE = b"\x09"
+"""packet type of the handshake request"""
+_Q_STAT_TYPE = b"\x00"
+"""packet type of the stat request"""
+_Q_PADDING = b"\x00\x00\x00\x00"
+"""padding that turns a basic stat request into a full stat request"""
+
+_FORMATTING_CODE_RE = re.compile("§.")
+"""Legacy formatting codes (section sign followed by one code character)"""
+
+
+def _strip_formatting_codes(text: str) -> str:
+    """Remove legacy formatting codes, returning plain text (the common case) untouched."""
+    return _FORMATTING_CODE_RE.sub("", text) if "§" in text else text
+
+
+def _resolve_sockaddr(host: str, port: int, family: int) -> tuple:
+    """
+    Resolve `host` to a socket address for `family`.
+
+    Falls back to the unresolved `(host, port)` pair if resolution fails,
+    so the error surfaces as a connection failure in the query methods.
+    """
+    try:
+        sockaddr = socket.getaddrinfo(host, None, family)[0][4]
+    except (OSError, UnicodeError):
+        return host, port
+    return (sockaddr[0], port, *sockaddr[2:])
+
+
+def _decode_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    """
+    Decode a varint from `buf` starting at `pos`.
+
+    :return: the decoded value and the position right after it
+    :raises IndexError: if the varint is cut off by the end of `buf`
+    """
+    byte = buf[pos]
+    value = byte & 0x7F
+    pos += 1
+    shift = 7
+    while byte & 0x80:
+        byte = buf[pos]
+        value |= (byte & 0x7F) << shift
+        pos += 1
+        shift += 7
+    return value, pos
+
 
 class ConnStatus(Enum):
     """
@@ -175,6 +253,25 @@ class MineStat:
     """default UDP port for Bedrock/MCPE IPv6 servers"""
     DEFAULT_TIMEOUT = 5
     """default TCP timeout in seconds"""
+    BEDROCK_PROBE_TIMEOUT = 1.5
+    """upper bound for the Bedrock probe timeout in auto detection mode, in seconds"""
+    RESULT_FIELDS = (
+        "online",
+        "version",
+        "plugins",
+        "motd",
+        "current_players",
+        "max_players",
+        "player_list",
+        "map",
+        "latency",
+        "slp_protocol",
+        "protocol_version",
+        "favicon_b64",
+        "gamemode",
+        "connection_status",
+    )
+    """attributes holding the outcome of a query, as opposed to its settings"""
 
     def __init__(
         self,
@@ -221,16 +318,22 @@ class MineStat:
 
         self.port: int = port
         """port number the Minecraft server accepts connections on"""
+        self._refer_utf8: bytes = self.refer.encode("utf8")
+        """refer as sent in the JSON SLP handshake"""
+        self._refer_utf16: bytes = self.refer.encode("utf-16-be")
+        """refer as sent in the extended legacy SLP ping"""
         self.online: bool = False
         """online or offline?"""
         self.version: str | None = None
         """server version"""
         self.plugins: list[str] | None = None
         """list of plugins returned by the Query protcol, may be empty"""
-        self.motd: str | None = None
-        """message of the day, unchanged server response (including formatting codes/JSON)"""
-        self.stripped_motd: str | None = None
-        """message of the day, stripped of all formatting ("human-readable")"""
+        self._motd: str | dict | list | None = None
+        """message of the day as received, JSON chat components are serialized lazily"""
+        self._motd_str: str | None = None
+        """`motd` as a string, computed on first access"""
+        self._stripped_motd: str | None = None
+        """`stripped_motd`, computed on first access"""
         self.current_players: int | None = None
         """current number of players online"""
         self.max_players: int | None = None
@@ -249,8 +352,8 @@ class MineStat:
         """Server protocol version"""
         self.favicon_b64: str | None = None
         """base64-encoded favicon possibly contained in JSON 1.7 responses"""
-        self.favicon: str | None = None
-        """decoded favicon data"""
+        self._favicon_raw: bytes | None = None
+        """`favicon_raw`, decoded on first access"""
         self.gamemode: str | None = None
         """Bedrock specific: The current game mode (Creative/Survival/Adventure)"""
         self.srv_record: bool | None = None
@@ -266,6 +369,13 @@ class MineStat:
         # address, but from an internal client, only the internal address is reachable
         # See https://docs.python.org/3/library/socket.html#socket.getaddrinfo
 
+        # Resolve the hostname once, so the protocol attempts below don't each
+        # go through the system resolver again.
+        self._sockaddr: tuple = _resolve_sockaddr(
+            address, port, socket.AF_INET6 if use_ipv6 else socket.AF_INET
+        )
+        """resolved socket address used to connect to the server"""
+
         # If the user wants a specific protocol, use only that.
         result = ConnStatus.UNKNOWN
         if query_protocol is not SlpProtocols.ALL:
@@ -291,22 +401,45 @@ class MineStat:
         # An example is MC 1.4: Nothing works directly after a json request.
         # A legacy query alone works fine.
 
-        # Minecraft Bedrock/Pocket/Education Edition (MCPE/MCEE)
-        if autoport and not self.port:
-            if use_ipv6:
-               self.port = self.DEFAULT_BEDROCK_PORT_V6
-            else:
-               self.port = self.DEFAULT_BEDROCK_PORT_V4
+        # An explicitly given default Java port can only be a Java edition server,
+        # don't wait for a Bedrock probe that is bound to time out.
+        if not autoport and port == self.DEFAULT_TCP_PORT:
+            self._java_query_chain()
+            return
 
-        result = self.bedrock_raknet_query()
-        self.connection_status = result
+        # Minecraft Bedrock/Pocket/Education Edition (MCPE/MCEE)
+        # The RakNet ping uses UDP and does not disturb the TCP-based Java probes,
+        # so it runs in a worker thread while the Java probes below are tried.
+        # A live Bedrock server answers within milliseconds, so its timeout is capped.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            bedrock_future = executor.submit(
+                MineStat,
+                self.address,
+                self.port,
+                min(timeout, self.BEDROCK_PROBE_TIMEOUT),
+                SlpProtocols.BEDROCK_RAKNET,
+                self.refer,
+                use_ipv6,
+            )
+            self._java_query_chain()
+            bedrock = bedrock_future.result()
 
-        if result is ConnStatus.SUCCESS:
-            return
+        # A Bedrock answer takes precedence, as it did when it was probed first
+        if bedrock.connection_status is ConnStatus.SUCCESS:
+            self._adopt_result(bedrock)
 
-        if autoport and not self.port:
-            self.port = self.DEFAULT_TCP_PORT
+    def _adopt_result(self, other: "MineStat") -> None:
+        """
+        Take over the query results of `other`, keeping this instance's own timeout and address.
+        """
+        for field in self.RESULT_FIELDS:
+            setattr(self, field, getattr(other, field))
+        self._favicon_raw = None
 
+    def _java_query_chain(self) -> None:
+        """
+        Try the Java edition SLP protocols, oldest first, and set `connection_status`.
+        """
         # Minecraft 1.4 & 1.5 (legacy SLP)
         result = self.legacy_query()
 
@@ -324,6 +457,50 @@ class MineStat:
 
         self.connection_status = ConnStatus.SUCCESS if self.online else result
 
+    @property
+    def motd(self) -> str | None:
+        """message of the day, unchanged server response (including formatting codes/JSON)"""
+        if self._motd_str is None and self._motd is not None:
+            self._motd_str = (
+                self._motd if isinstance(self._motd, str) else json.dumps(self._motd)
+            )
+        return self._motd_str
+
+    @motd.setter
+    def motd(self, value: str | dict | list | None) -> None:
+        self._motd = value
+        self._motd_str = None
+        self._stripped_motd = None
+
+    @property
+    def stripped_motd(self) -> str | None:
+        """
+        message of the day, stripped of all formatting ("human-readable")
+
+        Only the text output needs it, so it is computed from the raw MOTD on first access.
+        """
+        if self._stripped_motd is None and self._motd is not None:
+            self._stripped_motd = self.motd_strip_formatting(self._motd)
+        return self._stripped_motd
+
+    @property
+    def favicon_raw(self) -> bytes | None:
+        """
+        decoded favicon image bytes (PNG)
+
+        Only the text output needs the raw image, so it is decoded from `favicon_b64` on first access.
+        """
+        if self._favicon_raw is None and self.favicon_b64:
+            self._favicon_raw = base64.b64decode(self.favicon_b64.split("base64,", 1)[1])
+        return self._favicon_raw
+
+    @property
+    def favicon(self) -> str | None:
+        """decoded favicon data, one character per byte"""
+        if self.favicon_raw is None:
+            return None
+        return self.favicon_raw.decode("latin-1")
+
     @staticmethod
     def motd_strip_formatting(raw_motd: str | dict) -> str:
         """
@@ -332,19 +509,22 @@ class MineStat:
 
         :param raw_motd: The raw MOTD, either as a string or dict (from "json.loads()")
         """
-        stripped_motd = ""
-
         if isinstance(raw_motd, str):
-            stripped_motd = re.sub(r"§.", "", raw_motd)
-
-        elif isinstance(raw_motd, dict):
-            stripped_motd = raw_motd.get("text", "")
-
-            if raw_motd.get("extra"):
-                for sub in raw_motd["extra"]:
-                    stripped_motd += MineStat.motd_strip_formatting(sub)
-
-        return stripped_motd
+            return _strip_formatting_codes(raw_motd)
+
+        # Walk nested "extra" components with an explicit stack (depth-first, in order)
+        parts: list[str] = []
+        stack: list[str | dict] = [raw_motd]
+        while stack:
+            component = stack.pop()
+            if isinstance(component, str):
+                parts.append(_strip_formatting_codes(component))
+            elif isinstance(component, dict):
+                parts.append(component.get("text", ""))
+                if component.get("extra"):
+                    stack.extend(reversed(component["extra"]))
+
+        return "".join(parts)
 
     def bedrock_raknet_query(self) -> ConnStatus:
         """
@@ -357,54 +537,15 @@ class MineStat:
         Packet loss handling should be implemented (resending).
         """
 
-        RAKNET_MAGIC = bytearray(
-            [
-                0x00,
-                0xFF,
-                0xFF,
-                0x00,
-                0xFE,
-                0xFE,
-                0xFE,
-                0xFE,
-                0xFD,
-                0xFD,
-                0xFD,
-                0xFD,
-                0x12,
-                0x34,
-                0x56,
-                0x78,
-            ]
-        )
-
-        # Create socket with type DGRAM (for UDP)
-        if self.use_ipv6:
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-        else:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-        sock.settimeout(self.timeout)
-
-        try:
-            self._extracted_from_beta_query_19(sock)
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except OSError:
-            return ConnStatus.CONNFAIL
-
         # Construct the `Unconnected_Ping` packet
         # Packet ID - 0x01
         req_data = bytearray([0x01])
         # current unix timestamp in ms as signed long (64-bit) LE-encoded
-        req_data += struct.pack("<q", int(time() * 1000))
+        req_data += _INT64_LE.pack(int(time() * 1000))
         # RakNet MAGIC (0x00ffff00fefefefefdfdfdfd12345678)
-        req_data += RAKNET_MAGIC
+        req_data += _RAKNET_MAGIC
         # Client GUID - as signed long (64-bit) LE-encoded
-        req_data += struct.pack("<q", 0x02)
-
-        sock.send(req_data)
-
-        # Do all the receiving in a try-catch, to reduce duplication of error handling
+        req_data += _INT64_LE.pack(0x02)
 
         # response packet:
         # byte - 0x1C - Unconnected Pong
@@ -414,41 +555,33 @@ class MineStat:
         # short - Server ID string length
         # string - Server ID string
         try:
-            response_buffer, response_addr = sock.recvfrom(1024)
-            response_stream = io.BytesIO(response_buffer)
-
-            # Receive packet id
-            packet_id = response_stream.read(1)
-
-            # Response packet ID should always be 0x1c
-            if packet_id != b"\x1c":
-                return ConnStatus.UNKNOWN
-
-            # Receive (& ignore) response timestamp
-            response_timestamp = struct.unpack("<q", response_stream.read(8))
-
-            # Server GUID
-            response_server_guid = struct.unpack("<q", response_stream.read(8))
+            # The socket is connected (type DGRAM for UDP), so the kernel only delivers
+            # datagrams from the server and reports ICMP errors (closed port) right away.
+            with self._managed_socket(socket.SOCK_DGRAM) as sock:
+                sock.send(req_data)
+                response_buffer = sock.recv(1024)
+
+        except OSError as exc:
+            return self._status_from_exc(exc)
+
+        # Response packet ID should always be 0x1c,
+        # the fixed-size header is 35 bytes long
+        if len(response_buffer) < 35 or response_buffer[0] != 0x1C:
+            return ConnStatus.UNKNOWN
 
-            # Magic
-            response_magic = response_stream.read(16)
-            if response_magic != RAKNET_MAGIC:
-                return ConnStatus.UNKNOWN
+        # Timestamp (1:9) and server GUID (9:17) are not used
 
-            # Server ID string length
-            response_id_string_length = struct.unpack(">h", response_stream.read(2))
+        # Magic
+        if response_buffer[17:33] != _RAKNET_MAGIC:
+            return ConnStatus.UNKNOWN
 
-            # Receive server ID string
-            response_id_string = response_stream.read().decode("utf8")
+        # Server ID string length
+        (response_id_string_length,) = _INT16_BE.unpack_from(response_buffer, 33)
 
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except (ConnectionResetError, ConnectionAbortedError):
-            return ConnStatus.UNKNOWN
-        except OSError:
-            return ConnStatus.CONNFAIL
-        finally:
-            sock.close()
+        # Receive server ID string
+        response_id_string = response_buffer[
+            35 : 35 + response_id_string_length
+        ].decode("utf8")
 
         # Set protocol version
         self.slp_protocol = SlpProtocols.BEDROCK_RAKNET
@@ -457,50 +590,39 @@ class MineStat:
         return self.__parse_bedrock_payload(response_id_string)
 
     def __parse_bedrock_payload(self, payload_str: str) -> ConnStatus:
-        motd_index = [
-            "edition",
-            "motd_1",
-            "protocol_version",
-            "version",
-            "current_players",
-            "max_players",
-            "server_uid",
-            "motd_2",
-            "gamemode",
-            "gamemode_numeric",
-            "port_ipv4",
-            "port_ipv6",
-        ]
-        payload = dict(zip(motd_index, payload_str.split(";")))
+        # Fields: edition;motd_1;protocol_version;version;current_players;max_players;
+        #         server_uid;motd_2;gamemode;gamemode_numeric;port_ipv4;port_ipv6
+        # Older Bedrock server versions do not respond with the secondary MotD or the game mode,
+        # missing trailing fields are padded with None.
+        fields: list[str | None] = payload_str.split(";")  # type: ignore
+        if len(fields) < 6:
+            return ConnStatus.UNKNOWN
+        fields += [None] * (9 - len(fields))
+        (
+            edition,
+            motd_1,
+            protocol_version,
+            version,
+            current_players,
+            max_players,
+            _server_uid,
+            motd_2,
+            gamemode,
+        ) = fields[:9]
 
         self.online = True
-        self.protocol_version = int(payload["protocol_version"])
+        self.protocol_version = int(protocol_version)  # type: ignore
 
-        self.current_players = int(payload["current_players"])
-        self.max_players = int(payload["max_players"])
-        try:
-            self.version = (
-                payload["version"]
-                + " "
-                + payload["motd_2"]
-                + " ("
-                + payload["edition"]
-                + ")"
-            )
-        except (
-            KeyError
-        ):  # older Bedrock server versions do not respond with the secondary MotD.
-            self.version = payload["version"] + " (" + payload["edition"] + ")"
+        self.current_players = int(current_players)  # type: ignore
+        self.max_players = int(max_players)  # type: ignore
+        if motd_2 is not None:
+            self.version = f"{version} {motd_2} ({edition})"
+        else:
+            self.version = f"{version} ({edition})"
 
-        self.motd = payload["motd_1"]
-        self.stripped_motd = self.motd_strip_formatting(self.motd)
+        self.motd = motd_1
 
-        try:
-            self.gamemode = payload["gamemode"]
-        except (
-            KeyError
-        ):  # older Bedrock server versions do not respond with the game mode.
-            self.gamemode = None
+        self.gamemode = gamemode
 
         return ConnStatus.SUCCESS
 
@@ -522,23 +644,9 @@ class MineStat:
         #   send full stat request
         #   receive status data
 
-        # Create UDP socket and set timeout
-        if self.use_ipv6:
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-        else:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(self.timeout)
-
-        # padding that is prefixes to every packet
-        magic = b"\xfe\xfd"
-
-        # packettypes for the multiple packets send by the client
-        handshake_packettype = struct.pack("!B", 9)
-        stat_packettype = struct.pack("!B", 0)
-
         # generate session id
         session_id_int = random.randint(0, 2147483648) & 0x0F0F0F0F
-        session_id_bytes = struct.pack(">l", session_id_int)
+        session_id_bytes = _INT32_BE.pack(session_id_int)
 
         # handshake packet:
         #   contains 0xFE0xFD as a prefix
@@ -546,54 +654,47 @@ class MineStat:
         #   contains session id (is generated randomly at the begining)
 
         # construct the handshake packet
-        handshake_packet = magic
-        handshake_packet += handshake_packettype
-        handshake_packet += session_id_bytes
-
-        # send packet to server
-        sock.sendto(handshake_packet, (self.address, self.port))
+        handshake_packet = _Q_MAGIC + _Q_HANDSHAKE_TYPE + session_id_bytes
 
         try:
-            # receive the handshake response
-            handshake_res = sock.recv(24)
-
-            # extract the challenge token from the server. The beginning of the packet can be ignored.
-            challenge_token = handshake_res[5:].rstrip(b"\00")
-
-            # pack the challenge token into a big-endian long (int32)
-            challenge_token_bytes = struct.pack(">l", int(challenge_token))
-
-            # full stat request packet:
-            #   contains 0xFE0xFD as a prefix
-            #   contains type of the packet, 0 for hanshaking in this case (encoded as a big-endian integer)
-            #   contains session id (is generated randomly at the beginning)
-            #   contains challenge token (received during the handshake)
-            #   contains 0x00 0x00 0x00 0x00 as padding (a basic stat request does not include these bytes)
-
-            # construct the request packet
-            req_packet = magic
-            req_packet += stat_packettype
-            req_packet += session_id_bytes
-            req_packet += challenge_token_bytes
-            req_packet += b"\x00\x00\x00\x00"
-
-            # send packet to server
-            sock.sendto(req_packet, (self.address, self.port))
+            # Create UDP socket and set timeout
+            with self._managed_socket(socket.SOCK_DGRAM) as sock:
+                # send packet to server
+                sock.send(handshake_packet)
+
+                # receive the handshake response
+                handshake_res = sock.recv(24)
+
+                # extract the challenge token from the server. The beginning of the packet can be ignored.
+                challenge_token = handshake_res[5:].rstrip(b"\00")
+
+                # pack the challenge token into a big-endian long (int32)
+                challenge_token_bytes = _INT32_BE.pack(int(challenge_token))
+
+                # full stat request packet:
+                #   contains 0xFE0xFD as a prefix
+                #   contains type of the packet, 0 for hanshaking in this case (encoded as a big-endian integer)
+                #   contains session id (is generated randomly at the beginning)
+                #   contains challenge token (received during the handshake)
+                #   contains 0x00 0x00 0x00 0x00 as padding (a basic stat request does not include these bytes)
+
+                # construct the request packet
+                req_packet = (
+                    _Q_MAGIC
+                    + _Q_STAT_TYPE
+                    + session_id_bytes
+                    + challenge_token_bytes
+                    + _Q_PADDING
+                )
 
-            # receive requested status data
-            raw_res = sock.recv(4096)
+                # send packet to server
+                sock.send(req_packet)
 
-            # close the socket
-            sock.close()
+                # receive requested status data
+                raw_res = sock.recv(4096)
 
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except (ConnectionResetError, ConnectionAbortedError):
-            return ConnStatus.UNKNOWN
-        except OSError:
-            return ConnStatus.CONNFAIL
-        finally:
-            sock.close()
+        except OSError as exc:
+            return self._status_from_exc(exc)
 
         return self.__parse_query_payload(raw_res)
 
@@ -625,49 +726,38 @@ class MineStat:
         stat_list = raw_stats.split(b"\x00")[2:]
 
         # move keys and values into a dictonary, the keys are also decoded
-        key = True
-        stats = {}
-        for index, key_name in enumerate(stat_list):
-            if key:
-                stats[key_name.decode("utf-8")] = stat_list[index + 1]
-                key = False
-            else:
-                key = True
-
-        # extract motd, the motd is named "hostname" in the Query protocol
-        if "hostname" in stats:
-            self.motd = stats["hostname"].decode("iso_8859_1")
+        # (keys and values alternate, so pair up consecutive elements)
+        stat_iter = iter(stat_list)
+        stats = {key.decode("utf-8"): value for key, value in zip(stat_iter, stat_iter)}
 
+        # extract motd, the motd is named "hostname" in the Query protocol,
         # the "MOTD" key is used in a basic stats query reponse
-        elif "MOTD" in stats:
-            self.motd = stats["MOTD"].decode("iso_8859_1")
-
-        if self.motd is not None:
-            # remove potential formatting
-            self.stripped_motd = self.motd_strip_formatting(self.motd)
+        raw_motd = stats.get("hostname")
+        if raw_motd is None:
+            raw_motd = stats.get("MOTD")
+        if raw_motd is not None:
+            self.motd = raw_motd.decode("iso_8859_1")
 
         # extract the servers Minecraft version
-        if "version" in stats:
-            self.version = stats["version"].decode("utf-8")
-
-            # extract list of plugins
-        if "plugins" in stats:
-            raw_plugins = stats["plugins"].decode("utf-8")
-            if raw_plugins != "":
-                # the plugins are separated by " ;"
-                self.plugins = raw_plugins.split(" ;")
-                # there may be information about the server software in the first plugin element
-                # example: ["Paper on 1.19.3: AnExampleMod 7.3", "AnotherExampleMod 4.2", ...]
-                # more information on https://wiki.vg/Query
-                if ":" in self.plugins[0]:  # type: ignore
-                    self.version, self.plugins[0] = self.plugins[0].split(": ")  # type: ignore
+        if (raw_version := stats.get("version")) is not None:
+            self.version = raw_version.decode("utf-8")
+
+        # extract list of plugins
+        if raw_plugins := stats.get("plugins"):
+            # the plugins are separated by ";" (usually followed by a space)
+            self.plugins = [plugin.strip() for plugin in raw_plugins.decode("utf-8").split(";")]
+            # there may be information about the server software in the first plugin element
+            # example: ["Paper on 1.19.3: AnExampleMod 7.3", "AnotherExampleMod 4.2", ...]
+            # more information on https://wiki.vg/Query
+            if ": " in self.plugins[0]:
+                self.version, self.plugins[0] = self.plugins[0].split(": ", 1)
 
         # extract the name of the map the server is running on
-        if "map" in stats:
-            self.map = stats["map"].decode("utf-8")
+        if (raw_map := stats.get("map")) is not None:
+            self.map = raw_map.decode("utf-8")
 
-        if "numplayers" in stats:
-            self.current_players = int(stats["numplayers"])
+        if (raw_numplayers := stats.get("numplayers")) is not None:
+            self.current_players = int(raw_numplayers)
             self.max_players = int(stats["maxplayers"])
 
         # split players (seperated by 0x00)
@@ -686,77 +776,52 @@ class MineStat:
 
         See https://wiki.vg/Server_List_Ping#Current
         """
-        if self.use_ipv6:
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
-        else:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.timeout)
+        # Construct Handshake packet: packet id 0x00, protocol version `-1`
+        # (used when pinging to determine the version), server address encoded
+        # with UTF8 and prefixed with its length in bytes, server port and the
+        # next packet state (1 for status, 2 for login)
+        req_data = b"".join(
+            (
+                _JSON_HANDSHAKE_PREFIX,
+                self._pack_varint(len(self._refer_utf8)),
+                self._refer_utf8,
+                _UINT16_BE.pack(self.port),
+                b"\x01",
+            )
+        )
 
+        # Do all the sending and receiving in a try-catch, to reduce duplication of error handling.
+        # Reads go through a buffered stream, so the single-byte varint reads
+        # below are served from memory instead of one recv() call each.
         try:
-            self._extracted_from_beta_query_19(sock)
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except OSError:
-            return ConnStatus.CONNFAIL
-
-        # Construct Handshake packet
-        req_data = bytearray([0x00])
-        # Add protocol version. If pinging to determine version, use `-1`
-        req_data += bytearray([0xFF, 0xFF, 0xFF, 0xFF, 0x0F])
-        # Add server address length
-        req_data += self._pack_varint(len(self.refer))
-        # Server address. Encoded with UTF8
-        req_data += bytearray(self.refer, "utf8")
-        # Server port
-        req_data += struct.pack(">H", self.port)
-        # Next packet state (1 for status, 2 for login)
-        req_data += bytearray([0x01])
-
-        # Prepend full packet length
-        req_data = self._pack_varint(len(req_data)) + req_data
-
-        # Now actually send the constructed client request
-        sock.send(req_data)
-
-        # Now send empty "Request" packet
-        # varint len, 0x00
-        sock.send(bytearray([0x01, 0x00]))
-
-        # Do all the receiving in a try-catch, to reduce duplication of error handling
-        try:
-            # Receive answer: full packet length as varint
-            packet_len = self._unpack_varint(sock)
+            with self._managed_socket() as sock, sock.makefile("rb") as stream:
+                # Send the handshake prefixed with its full packet length,
+                # followed by the empty "Request" packet (varint len, 0x00)
+                sock.sendall(self._pack_varint(len(req_data)) + req_data + b"\x01\x00")
 
-            # Check if full packet length seems acceptable
-            if packet_len < 3:
-                return ConnStatus.UNKNOWN
+                # Receive answer: full packet length, packet id and payload length as varints
+                packet_len, packet_id, content_len = self._read_varints(stream, 3)
 
-            # Receive actual packet id
-            packet_id = self._unpack_varint(sock)
+                # Check if full packet length seems acceptable
+                if packet_len < 3:
+                    return ConnStatus.UNKNOWN
 
-            # If we receive a packet with id 0x19, something went wrong.
-            # Usually the payload is JSON text, telling us what exactly.
-            # We could stop here, and display something to the user, as this is not normal
-            # behaviour, maybe a bug somewhere here.
+                # If we receive a packet with id 0x19, something went wrong.
+                # Usually the payload is JSON text, telling us what exactly.
+                # We could stop here, and display something to the user, as this is not normal
+                # behaviour, maybe a bug somewhere here.
 
-            # Instead I am just going to check for the correct packet id: 0x00
-            if packet_id != 0:
-                return ConnStatus.UNKNOWN
+                # Instead I am just going to check for the correct packet id: 0x00
+                if packet_id != 0:
+                    return ConnStatus.UNKNOWN
 
-            # Receive & unpack payload length
-            content_len = self._unpack_varint(sock)
+                # Receive full payload
+                payload_raw = stream.read(content_len)
+                if len(payload_raw) < content_len:
+                    raise ConnectionAbortedError
 
-            # Receive full payload
-            payload_raw = self._recv_exact(sock, content_len)
-
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except (ConnectionResetError, ConnectionAbortedError):
-            return ConnStatus.UNKNOWN
-        except OSError:
-            return ConnStatus.CONNFAIL
-        finally:
-            sock.close()
+        except OSError as exc:
+            return self._status_from_exc(exc)
 
         # Set protocol version
         self.slp_protocol = SlpProtocols.JSON
@@ -772,22 +837,18 @@ class MineStat:
         :param payload_raw: The raw SLP payload, without header and string lenght
         """
         try:
-            payload_obj = json.loads(payload_raw.decode("utf8"))
-        except json.JSONDecodeError:
+            payload_obj = _json_loads(payload_raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
             return ConnStatus.UNKNOWN
 
         # Now that we have the status object, set all fields
         self.version = payload_obj["version"]["name"]
         self.protocol_version = payload_obj["version"]["protocol"]
 
-        # The motd might be a string directly, not a json object
-        if isinstance(payload_obj.get("description", ""), str):
-            self.motd = payload_obj.get("description", "")
-        else:
-            self.motd = json.dumps(payload_obj["description"])
-        self.stripped_motd = self.motd_strip_formatting(
-            payload_obj.get("description", "")
-        )
+        # The motd might be a string directly, not a json object.
+        # A json object is kept as is and only serialized when `motd` is read.
+        description = payload_obj.get("description", "")
+        self.motd = description
 
         players = payload_obj.get("players", {})
         self.max_players = players.get("max", -1)
@@ -799,23 +860,19 @@ class MineStat:
 
         try:
             self.favicon_b64 = payload_obj["favicon"]
-            if self.favicon_b64:
-                self.favicon = str(
-                    base64.b64decode(self.favicon_b64.split("base64,")[1]), "ISO-8859–1"
-                )
         except KeyError:
             self.favicon_b64 = None
-            self.favicon = None
+        self._favicon_raw = None
 
         # If we got here, everything is in order.
         self.online = True
         return ConnStatus.SUCCESS
 
-    def _unpack_varint(self, sock: socket.socket) -> int:
-        """Small helper method for unpacking an int from an varint (streamed from socket)."""
+    def _unpack_varint(self, stream: io.BufferedIOBase) -> int:
+        """Small helper method for unpacking an int from an varint (read from a buffered socket stream)."""
         data = 0
         for i in range(5):
-            ordinal = sock.recv(1)
+            ordinal = stream.read(1)
 
             if len(ordinal) == 0:
                 break
@@ -828,19 +885,38 @@ class MineStat:
 
         return data
 
+    def _read_varints(self, stream: io.BufferedReader, count: int) -> list[int]:
+        """
+        Read `count` consecutive varints from a buffered socket stream. They are decoded
+        straight from the stream's read buffer and fall back to byte-wise reads only if
+        the buffer does not hold all of them yet.
+        """
+        buf = stream.peek(5 * count)
+        values = []
+        pos = 0
+        try:
+            for _ in range(count):
+                value, pos = _decode_varint(buf, pos)
+                values.append(value)
+        except IndexError:
+            return [self._unpack_varint(stream) for _ in range(count)]
+
+        stream.read(pos)
+        return values
+
     def _pack_varint(self, data) -> bytes:
         """Small helper method for packing a varint from an int."""
-        ordinal = b""
+        ordinal = bytearray()
 
         while True:
             byte = data & 0x7F
             data >>= 7
-            ordinal += struct.pack("B", byte | (0x80 if data > 0 else 0))
 
             if data == 0:
-                break
+                ordinal.append(byte)
+                return bytes(ordinal)
 
-        return ordinal
+            ordinal.append(byte | 0x80)
 
     def extended_legacy_query(self) -> ConnStatus:
         """
@@ -850,71 +926,52 @@ class MineStat:
         See https://wiki.vg/Server_List_Ping#1.6
         :return:
         """
-        if self.use_ipv6:
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
-        else:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.timeout)
+        refer = self._refer_utf16
+        req_data = b"".join(
+            (
+                _PING_HOST_PREFIX,
+                # 0xXX 0xXX byte count of rest of data, 7+len(serverhostname), as short
+                _INT16_BE.pack(7 + len(refer)),
+                # 0xXX [legacy] protocol version (before netty rewrite)
+                # Used here: 74 (MC 1.6.2)
+                b"\x49",
+                # strlen of serverhostname (big-endian short)
+                _INT16_BE.pack(len(refer) // 2),
+                # the hostname of the server
+                refer,
+                # port of the server, as int (4 byte)
+                _INT32_BE.pack(self.port),
+            )
+        )
 
         try:
-            self._extracted_from_beta_query_19(sock)
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except OSError:
-            return ConnStatus.CONNFAIL
-
-        # Send 0xFE as packet identifier,
-        # 0x01 as ping packet content
-        # 0xFA as packet identifier for a plugin message
-        # 0x00 0x0B as strlen of following string
-        req_data = bytearray([0xFE, 0x01, 0xFA, 0x00, 0x0B])
-        # the string 'MC|PingHost' as UTF-16BE encoded string
-        req_data += bytearray("MC|PingHost", "utf-16-be")
-        # 0xXX 0xXX byte count of rest of data, 7+len(serverhostname), as short
-        req_data += struct.pack(">h", 7 + (len(self.refer) * 2))
-        # 0xXX [legacy] protocol version (before netty rewrite)
-        # Used here: 74 (MC 1.6.2)
-        req_data += bytearray([0x49])
-        # strlen of serverhostname (big-endian short)
-        req_data += struct.pack(">h", len(self.refer))
-        # the hostname of the server
-        req_data += bytearray(self.refer, "utf-16-be")
-        # port of the server, as int (4 byte)
-        req_data += struct.pack(">i", self.port)
-
-        # Now send the contructed client requests
-        sock.send(req_data)
+            with self._managed_socket() as sock:
+                # Now send the contructed client requests
+                sock.sendall(req_data)
 
-        try:
-            # Receive answer packet id (1 byte)
-            packet_id = self._recv_exact(sock, 1)
+                # Receive answer packet id (1 byte)
+                packet_id = self._recv_exact(sock, 1)
 
-            # Check packet id (should be "kick packet 0xFF")
-            if packet_id[0] != 0xFF:
-                return ConnStatus.UNKNOWN
+                # Check packet id (should be "kick packet 0xFF")
+                if packet_id[0] != 0xFF:
+                    return ConnStatus.UNKNOWN
 
-            # Receive payload lengh (signed big-endian short; 2 byte)
-            raw_payload_len = self._recv_exact(sock, 2)
+                # Receive payload lengh (signed big-endian short; 2 byte)
+                raw_payload_len = self._recv_exact(sock, 2)
 
-            # Extract payload length
-            # Might be empty, if the server keeps the connection open but doesn't send anything
-            content_len = struct.unpack(">h", raw_payload_len)[0]
+                # Extract payload length
+                # Might be empty, if the server keeps the connection open but doesn't send anything
+                content_len = _INT16_BE.unpack(raw_payload_len)[0]
 
-            # Check if payload length is acceptable
-            if content_len < 3:
-                return ConnStatus.UNKNOWN
+                # Check if payload length is acceptable
+                if content_len < 3:
+                    return ConnStatus.UNKNOWN
 
-            # Receive full payload and close socket
-            payload_raw = self._recv_exact(sock, content_len * 2)
+                # Receive full payload
+                payload_raw = self._recv_exact(sock, content_len * 2)
 
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except (ConnectionResetError, ConnectionAbortedError, struct.error):
-            return ConnStatus.UNKNOWN
-        except OSError:
-            return ConnStatus.CONNFAIL
-        finally:
-            sock.close()
+        except (OSError, struct.error) as exc:
+            return self._status_from_exc(exc)
 
         # Set protocol version
         self.slp_protocol = SlpProtocols.EXTENDED_LEGACY
@@ -930,44 +987,16 @@ class MineStat:
 
         :return: ConnStatus
         """
-        if self.use_ipv6:
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
-        else:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.timeout)
-
         try:
-            self._extracted_from_beta_query_19(sock)
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except OSError:
-            return ConnStatus.CONNFAIL
+            with self._managed_socket() as sock:
+                # Send 0xFE 0x01 as packet id
+                sock.sendall(bytes([0xFE, 0x01]))
 
-        # Send 0xFE 0x01 as packet id
-        sock.send(bytearray([0xFE, 0x01]))
+                # Receive answer packet id, payload length and payload
+                payload_raw = self._recv_kick_packet(sock)
 
-        # Receive answer packet id (1 byte) and payload lengh (signed big-endian short; 2 byte)
-        try:
-            raw_header = self._recv_exact(sock, 3)
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except (ConnectionAbortedError, ConnectionResetError):
-            return ConnStatus.UNKNOWN
-        except OSError:
-            return ConnStatus.CONNFAIL
-
-        # Extract payload length
-        # Might be empty, if the server keeps the connection open but doesn't send anything
-        try:
-            content_len = struct.unpack(">xh", raw_header)[0]
-        except struct.error:
-            return ConnStatus.UNKNOWN
-        try:
-            # Receive full payload and close socket
-            payload_raw = bytearray(self._recv_exact(sock, content_len * 2))
-        except ConnectionAbortedError:
-            return ConnStatus.UNKNOWN
-        sock.close()
+        except (OSError, struct.error) as exc:
+            return self._status_from_exc(exc)
 
         # Set protocol version
         self.slp_protocol = SlpProtocols.LEGACY
@@ -1004,7 +1033,6 @@ class MineStat:
         self.version = payload_list[2]
         # - the MOTD
         self.motd = payload_list[3]
-        self.stripped_motd = self.motd_strip_formatting(payload_list[3])
         # - the online player count
         self.current_players = int(payload_list[4])
         # - the max player count
@@ -1021,44 +1049,16 @@ class MineStat:
 
         :return: ConnStatus
         """
-        if self.use_ipv6:
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
-        else:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.timeout)
-
         try:
-            self._extracted_from_beta_query_19(sock)
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except OSError:
-            return ConnStatus.CONNFAIL
+            with self._managed_socket() as sock:
+                # Send 0xFE as packet id
+                sock.sendall(bytes([0xFE]))
 
-        # Send 0xFE as packet id
-        sock.send(bytearray([0xFE]))
+                # Receive answer packet id, payload length and payload
+                payload_raw = self._recv_kick_packet(sock)
 
-        # Receive answer packet id (1 byte) and payload lengh (signed big-endian short; 2 byte)
-        try:
-            raw_header = self._recv_exact(sock, 3)
-        except TimeoutError:
-            return ConnStatus.TIMEOUT
-        except (ConnectionResetError, ConnectionAbortedError):
-            return ConnStatus.UNKNOWN
-        except OSError:
-            return ConnStatus.CONNFAIL
-
-        # Extract payload length
-        # Might be empty, if the server keeps the connection open but doesn't send anything
-        try:
-            content_len = struct.unpack(">xh", raw_header)[0]
-        except struct.error:
-            return ConnStatus.UNKNOWN
-        try:
-        # Receive full payload and close socket
-            payload_raw = bytearray(self._recv_exact(sock, content_len * 2))
-        except ConnectionAbortedError:
-            return ConnStatus.UNKNOWN
-        sock.close()
+        except (OSError, struct.error) as exc:
+            return self._status_from_exc(exc)
 
         # Set protocol version
         self.slp_protocol = SlpProtocols.BETA
@@ -1082,7 +1082,6 @@ class MineStat:
         # The first value it the server MOTD
         # This could contain '§' itself, thats the reason for the join here
         self.motd = "§".join(payload_list[:-2])
-        self.stripped_motd = self.motd_strip_formatting("§".join(payload_list[:-2]))
 
         # Set general version, as the protocol doesn't contain the server version
         self.version = ">=1.8b/1.3"
@@ -1092,11 +1091,81 @@ class MineStat:
 
         return ConnStatus.SUCCESS
 
-    def _extracted_from_beta_query_19(self, sock):
+    @contextmanager
+    def _managed_socket(self, sock_type: int = socket.SOCK_STREAM) -> Iterator[socket.socket]:
+        """
+        Connect a socket of the given type to the resolved server address, recording the
+        connection latency, and close it again when the block exits.
+
+        TCP sockets are dialed with `socket.create_connection`, which also closes the socket
+        if the connect fails. UDP sockets are connected so that only datagrams from the
+        server are delivered.
+        """
         start_time = perf_counter()
-        sock.connect((self.address, self.port))
+        if sock_type == socket.SOCK_STREAM:
+            sock = socket.create_connection(self._sockaddr[:2], timeout=self.timeout)
+            # The pings are a few small writes followed by a read, don't let
+            # Nagle's algorithm hold them back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            sock = socket.socket(
+                socket.AF_INET6 if self.use_ipv6 else socket.AF_INET, sock_type
+            )
+            try:
+                sock.settimeout(self.timeout)
+                sock.connect(self._sockaddr)
+            except OSError:
+                sock.close()
+                raise
         self.latency = round((perf_counter() - start_time) * 1000)
 
+        try:
+            yield sock
+        finally:
+            sock.close()
+
+    @staticmethod
+    def _status_from_exc(exc: Exception) -> ConnStatus:
+        """
+        Map an exception raised while talking to the server to a connection status.
+
+        :param exc: OSError (or struct.error for malformed headers) raised by a query
+        :return: ConnStatus
+        """
+        if isinstance(exc, TimeoutError):
+            return ConnStatus.TIMEOUT
+        if isinstance(exc, (ConnectionResetError, ConnectionAbortedError, struct.error)):
+            return ConnStatus.UNKNOWN
+        return ConnStatus.CONNFAIL
+
+    def _recv_kick_packet(self, sock: socket.socket) -> bytearray:
+        """
+        Receive the kick packet answering a legacy or beta SLP ping and return its payload.
+
+        The packet consists of the packet id (1 byte), the payload length in characters
+        (signed big-endian short; 2 byte) and the UTF-16BE payload. It is small enough to
+        arrive in one segment, so a single large read is tried first and only the missing
+        rest is read afterwards.
+        Throws a ConnectionAbortedError if the connection was closed while waiting for data.
+
+        :param sock: Open socket to receive data from
+        :return: bytearray with the payload
+        """
+        buf = bytearray(sock.recv(4096))
+        if not buf:
+            raise ConnectionAbortedError
+        if len(buf) < 3:
+            buf += self._recv_exact(sock, 3 - len(buf))
+
+        # Extract payload length
+        # Might be empty, if the server keeps the connection open but doesn't send anything
+        (content_len,) = _LEGACY_HDR.unpack_from(buf)
+
+        packet_len = 3 + max(content_len, 0) * 2
+        if len(buf) < packet_len:
+            buf += self._recv_exact(sock, packet_len - len(buf))
+        return buf[3:packet_len]
+
     @staticmethod
     def _recv_exact(sock: socket.socket, size: int) -> bytearray:
         """
@@ -1107,11 +1176,13 @@ class MineStat:
         :param size: Amount of bytes of data to receive
         :return: bytearray with the received data
         """
-        data = bytearray()
+        data = bytearray(size)
+        view = memoryview(data)
+        received = 0
 
-        while len(data) < size:
-            if temp_data := bytearray(sock.recv(size - len(data))):
-                data += temp_data
+        while received < size:
+            if chunk_len := sock.recv_into(view[received:]):
+                received += chunk_len
 
             else:
                 raise ConnectionAbortedError
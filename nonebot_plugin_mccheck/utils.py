@@ -1,22 +1,161 @@
 import asyncio
-import base64
 import contextlib
+from dataclasses import dataclass
+from functools import lru_cache
 import os
 import re
+import socket
+import time
 import traceback
 
 import dns.asyncresolver
 import dns.name
 import idna
 from nonebot import require, logger
-import ujson
 
-from .configs import VERSION, lang, lang_data, message_type
+try:
+    # orjson 解析速度更快，已安装时优先使用
+    from orjson import JSONDecodeError
+    from orjson import loads as _json_loads
+except ImportError:
+    from ujson import JSONDecodeError
+    from ujson import loads as _json_loads
+
+from .configs import (
+    VERSION,
+    current_strings,
+    disable_srv,
+    lang,
+    lang_data,
+    message_type,
+)
 from .data_source import ConnStatus, MineStat, SlpProtocols
 
 require("nonebot_plugin_alconna")
+require("nonebot_plugin_htmlrender")
 from nonebot_plugin_alconna import Image as NImage
 from nonebot_plugin_alconna import Text
+from nonebot_plugin_htmlrender import template_to_pic
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+"""HTML 模板目录"""
+
+_RESOLVER: dns.asyncresolver.Resolver | None = None
+"""共享的 DNS 解析器，由 `_get_resolver` 创建"""
+
+_SRV_CACHE: dict[str, tuple[float, tuple[str, int] | None]] = {}
+"""SRV 解析缓存，键为域名，值为 (过期时间, (目标地址, 端口))，记录不存在时为 None"""
+SRV_CACHE_TTL = 300
+"""SRV 记录未携带 TTL 时的缓存时间（秒）"""
+SRV_CACHE_MAX_TTL = 900
+"""SRV 记录缓存时间上限（秒）"""
+SRV_NEGATIVE_TTL = 60
+"""域名不存在 SRV 记录时的缓存时间（秒）"""
+
+_ADDR_CACHE: dict[tuple[str, str], tuple[float, str | None]] = {}
+"""A/AAAA 解析缓存，键为 (域名, 记录类型)，值为 (过期时间, 地址)"""
+ADDR_CACHE_MIN_TTL = 60
+"""A/AAAA 记录缓存时间下限（秒）"""
+ADDR_CACHE_MAX_TTL = 900
+"""A/AAAA 记录缓存时间上限（秒）"""
+ADDR_NEGATIVE_TTL = 30
+"""域名不存在 A/AAAA 记录时的缓存时间（秒）"""
+
+DNS_CACHE_MAX_SIZE = 1024
+"""SRV 与 A/AAAA 解析缓存各自的最大条目数"""
+
+RESOLVE_TIMEOUT = 8
+"""单次地址解析（含 SRV 目标解析）的总耗时上限（秒）"""
+
+TCP_PROBE_TIMEOUT = 2
+"""Java版探测前 TCP 连通性检查的超时上限（秒）"""
+
+_TEXT_TEMPLATES: dict[str, tuple[str, str]] = {}
+"""文本消息模板缓存，键为语言，值为 (Java版模板, 基岩版模板)"""
+
+_HOST_RE = re.compile(r"(?:\[(.+?)\]|(.+?))(?:[:：](\d+))?$")
+"""匹配 `host`、`host:port` 及 `[IPv6]:port` 形式的地址"""
+
+_JAVA_PROTOCOLS = (
+    SlpProtocols.LEGACY,  # Minecraft 1.4 & 1.5
+    SlpProtocols.BETA,  # Minecraft Beta 1.8 to Release 1.3
+    SlpProtocols.EXTENDED_LEGACY,  # Minecraft 1.6
+    SlpProtocols.JSON,  # Minecraft 1.7+
+)
+"""Java版探测使用的 SLP 协议，按探测顺序排列，越靠后返回的信息越完整"""
+
+_DOMAIN_RE = re.compile(
+    r"^(?!-)(?:[A-Za-z0-9-]{1,63}\.)+(?:[A-Za-z]{2,})$|^(xn--[A-Za-z0-9-]{1,63})\.[A-Za-z]{2,}$"
+)
+"""匹配（punycode 编码后的）域名"""
+
+_COLOR_MAP = {
+    "black": ('<span style="color:#000000;">', "</span>"),
+    "dark_blue": ('<span style="color:#0000AA;">', "</span>"),
+    "dark_green": ('<span style="color:#00AA00;">', "</span>"),
+    "dark_aqua": ('<span style="color:#00AAAA;">', "</span>"),
+    "dark_red": ('<span style="color:#AA0000;">', "</span>"),
+    "dark_purple": ('<span style="color:#AA00AA;">', "</span>"),
+    "gold": ('<span style="color:#FFAA00;">', "</span>"),
+    "gray": ('<span style="color:#AAAAAA;">', "</span>"),
+    "dark_gray": ('<span style="color:#555555;">', "</span>"),
+    "blue": ('<span style="color:#0000FF;">', "</span>"),
+    "green": ('<span style="color:#00AA00;">', "</span>"),
+    "aqua": ('<span style="color:#00AAAA;">', "</span>"),
+    "red": ('<span style="color:#AA0000;">', "</span>"),
+    "light_purple": ('<span style="color:#FFAAFF;">', "</span>"),
+    "yellow": ('<span style="color:#FFFF00;">', "</span>"),
+    "white": ('<span style="color:#FFFFFF;">', "</span>"),
+    "reset": ("</b></i></u></s>", ""),
+    "bold": ("<b style='color: {};'>", "</b>"),
+    "italic": ("<i style='color: {};'>", "</i>"),
+    "underline": ("<u style='color: {};'>", "</u>"),
+    "strikethrough": ("<s style='color: {};'>", "</s>"),
+    "§0": ('<span style="color:#000000;">', "</span>"),  # black
+    "§1": ('<span style="color:#0000AA;">', "</span>"),  # dark blue
+    "§2": ('<span style="color:#00AA00;">', "</span>"),  # dark green
+    "§3": ('<span style="color:#00AAAA;">', "</span>"),  # dark aqua
+    "§4": ('<span style="color:#AA0000;">', "</span>"),  # dark red
+    "§5": ('<span style="color:#AA00AA;">', "</span>"),  # dark purple
+    "§6": ('<span style="color:#FFAA00;">', "</span>"),  # gold
+    "§7": ('<span style="color:#AAAAAA;">', "</span>"),  # gray
+    "§8": ('<span style="color:#555555;">', "</span>"),  # dark gray
+    "§9": ('<span style="color:#0000FF;">', "</span>"),  # blue
+    "§a": ('<span style="color:#00AA00;">', "</span>"),  # green
+    "§b": ('<span style="color:#00AAAA;">', "</span>"),  # aqua
+    "§c": ('<span style="color:#AA0000;">', "</span>"),  # red
+    "§d": ('<span style="color:#FFAAFF;">', "</span>"),  # light purple
+    "§e": ('<span style="color:#FFFF00;">', "</span>"),  # yellow
+    "§f": ('<span style="color:#FFFFFF;">', "</span>"),  # white
+    "§g": ('<span style="color:#DDD605;">', "</span>"),  # minecoin gold
+    "§h": ('<span style="color:#E3D4D1;">', "</span>"),  # material quartz
+    "§i": ('<span style="color:#CECACA;">', "</span>"),  # material iron
+    # material netherite
+    "§j": ('<span style="color:#443A3B;">', "</span>"),
+    "§l": ("<b style='color: {};'>", "</b>"),  # bold
+    "§m": ("<s style='color: {};'>", "</s>"),  # strikethrough
+    "§n": ("<u style='color: {};'>", "</u>"),  # underline
+    "§o": ("<i style='color: {};'>", "</i>"),  # italic
+    "§p": ('<span style="color:#DEB12D;">', "</span>"),  # material gold
+    "§q": ('<span style="color:#47A036;">', "</span>"),  # material emerald
+    "§r": ("</b></i></u></s>", ""),  # reset
+    "§s": ('<span style="color:#2CBAA8;">', "</span>"),  # material diamond
+    "§t": ('<span style="color:#21497B;">', "</span>"),  # material lapis
+    "§u": ('<span style="color:#9A5CC6;">', "</span>"),  # material amethyst
+}
+"""MOTD 颜色/样式名及样式代码到 HTML 标签 (开始标签, 结束标签) 的映射"""
+
+_STYLE_TAGS = tuple(
+    (style, _COLOR_MAP[style])
+    for style in ("bold", "italic", "underline", "strikethrough")
+)
+"""JSON MOTD 中的文字样式及其 HTML 标签，开始标签需填入颜色"""
+
+_STYLE_CODE_RE = re.compile("§[0-9a-zA-Z]")
+"""匹配 MOTD 中的样式代码"""
+
+_TAG_COLOR_RE = re.compile(r"color:\s*#([0-9A-Fa-f]{6});")
+"""提取 HTML 标签中的颜色值"""
 
 
 async def handle_exception(e):
@@ -26,7 +165,7 @@ async def handle_exception(e):
 
 
 async def change_language_to(language: str):
-    global lang
+    global lang, current_strings
 
     try:
         _ = lang_data[language]
@@ -36,9 +175,74 @@ async def change_language_to(language: str):
         if language == lang:
             return f"The language is already '{language}'!"
         lang = language
+        current_strings = lang_data[language]
         return f"Change to '{language}' success!"
 
 
+@dataclass(slots=True)
+class RenderData:
+    """HTML 模板 `default.html` 渲染所需的数据"""
+
+    favicon: str
+    """服务器图标（base64 data URI 或默认图标文件名）"""
+    version: str | None
+    """服务器版本（HTML）"""
+    slp_protocol: str
+    """SLP 协议"""
+    protocol_version: int | None
+    """协议版本"""
+    address: str
+    """用户查询的地址"""
+    ip: str
+    """实际连接的地址"""
+    port: int
+    """端口"""
+    delay: str
+    """延迟"""
+    gamemode: str | None
+    """游戏模式（仅基岩版）"""
+    motd: str | None
+    """MOTD（HTML）"""
+    players: str
+    """在线人数/最大人数"""
+    player_list: str | None
+    """在线玩家列表（HTML）"""
+    lang: dict[str, str]
+    """当前语言的字符串"""
+    plugin_version: str
+    """插件版本"""
+
+
+def _compile_text_templates(strings: dict[str, str]) -> tuple[str, str]:
+    """
+    根据语言字符串预先生成文本消息模板，请求时只需填入服务器信息。
+
+    参数:
+    - strings: 某一语言的字符串字典。
+
+    返回:
+    - tuple[str, str]: (Java版模板, 基岩版模板)，可直接用于 `str.format`。
+    """
+
+    def field(key: str, suffix: str = "") -> str:
+        label = strings[key].replace("{", "{{").replace("}", "}}")
+        return f"\n{label}{{{key}}}{suffix}"
+
+    head = "".join(
+        field(key)
+        for key in ("version", "slp_protocol", "protocol_version", "address", "ip", "port")
+    ) + field("delay", "ms")
+    tail = field("motd") + field("players")
+    return head + tail, head + field("gamemode") + tail
+
+
+def _get_text_templates() -> tuple[str, str]:
+    """获取当前语言的文本消息模板，首次使用时生成并缓存。"""
+    if (templates := _TEXT_TEMPLATES.get(lang)) is None:
+        templates = _TEXT_TEMPLATES[lang] = _compile_text_templates(current_strings)
+    return templates
+
+
 async def build_result(ms, address, type=0):
     """
     根据类型构建并返回查询结果。
@@ -51,70 +255,60 @@ async def build_result(ms, address, type=0):
     - 根据类型不同返回不同格式的查询结果。
     """
     if type == 0:
-        result = {
-            "favicon": ms.favicon_b64 if ms.favicon else "no_favicon.png",
-            "version": await parse_motd2html(ms.version),
-            "slp_protocol": str(ms.slp_protocol),
-            "protocol_version": ms.protocol_version,
-            "address": address,
-            "ip": ms.address,
-            "port": ms.port,
-            "delay": f"{ms.latency}ms",
-            "gamemode": ms.gamemode,
-            "motd": await parse_motd2html(ms.motd),
-            "players": f"{ms.current_players}/{ms.max_players}",
-            "player_list": await parse_motd2html("§r, ".join(ms.player_list))
+        result = RenderData(
+            favicon=ms.favicon_b64 or "no_favicon.png",
+            version=parse_motd2html(ms.version),
+            slp_protocol=ms.slp_protocol.name,
+            protocol_version=ms.protocol_version,
+            address=address,
+            ip=ms.address,
+            port=ms.port,
+            delay=f"{ms.latency}ms",
+            gamemode=ms.gamemode,
+            motd=parse_motd2html(ms.motd),
+            players=f"{ms.current_players}/{ms.max_players}",
+            player_list=parse_motd2html("§r, ".join(ms.player_list))
             if ms.player_list
             else None,
-            "lang": lang_data[lang],
-            "VERSION": VERSION,
-        }
-        from nonebot_plugin_htmlrender import template_to_pic
-
-        template_dir = os.path.join(os.path.dirname(__file__), "templates")
+            lang=current_strings,
+            plugin_version=VERSION,
+        )
         pic = await template_to_pic(
-            template_path=template_dir,
+            template_path=TEMPLATE_DIR,
             template_name="default.html",
             templates={"data": result},
         )
         return NImage(raw=pic)
-    elif type == 1:
-        motd_part = f"\n{lang_data[lang]['motd']}{ms.stripped_motd}"
-        version_part = f"\n{lang_data[lang]['version']}{ms.version}"
-
-    base_result = (
-        f"{version_part}"
-        f"\n{lang_data[lang]['slp_protocol']}{ms.slp_protocol}"
-        f"\n{lang_data[lang]['protocol_version']}{ms.protocol_version}"
-        f"\n{lang_data[lang]['address']}{address}"
-        f"\n{lang_data[lang]['ip']}{ms.address}"
-        f"\n{lang_data[lang]['port']}{ms.port}"
-        f"\n{lang_data[lang]['delay']}{ms.latency}ms"
-    )
 
-    if "BEDROCK" in str(ms.slp_protocol):
-        base_result += f"\n{lang_data[lang]['gamemode']}{ms.gamemode}"
-
-    result = (
-        base_result
-        + motd_part
-        + f"\n{lang_data[lang]['players']}{ms.current_players}/{ms.max_players}"
+    java_template, bedrock_template = _get_text_templates()
+    template = (
+        bedrock_template
+        if ms.slp_protocol is SlpProtocols.BEDROCK_RAKNET
+        else java_template
+    )
+    result = template.format(
+        version=ms.version,
+        slp_protocol=ms.slp_protocol,
+        protocol_version=ms.protocol_version,
+        address=address,
+        ip=ms.address,
+        port=ms.port,
+        delay=ms.latency,
+        gamemode=ms.gamemode,
+        motd=ms.stripped_motd,
+        players=f"{ms.current_players}/{ms.max_players}",
+    )
+    if ms.player_list:
+        result += f"\n{current_strings['player_list']}{', '.join(ms.player_list)}"
+    return (
+        [
+            Text(result),
+            Text("\nFavicon:"),
+            NImage(raw=ms.favicon_raw),
+        ]
+        if ms.favicon_raw is not None
+        else [Text(result)]
     )
-    if type == 1:
-        result += (
-            f"\n{lang_data[lang]['player_list']}{', '.join(ms.player_list)}"
-            if ms.player_list
-            else ""
-        )
-        return (
-            [
-                Text(result),
-                Text("\nFavicon:"),
-                NImage(raw=base64.b64decode(ms.favicon_b64.split(",")[1])),
-            ]
-            if ms.favicon is not None
-            else [Text(result)]
-        )
 
 
 async def get_mc(
@@ -133,13 +327,14 @@ async def get_mc(
     返回:
     - list: 包含Java版和Bedrock版服务器信息的列表。
     """
-    loop = asyncio.get_event_loop()
     if ip_type.startswith("SRV"):
-        return [await loop.run_in_executor(None, get_java, ip, port, ip_type, refer, timeout)]
-    return [
-        await loop.run_in_executor(None, get_java, ip, port, ip_type, refer,  timeout),
-        await loop.run_in_executor(None, get_bedrock, ip, port, ip_type, refer,  timeout),
-    ]
+        return [await get_java(ip, port, ip_type, refer, timeout)]
+    return list(
+        await asyncio.gather(
+            get_java(ip, port, ip_type, refer, timeout),
+            asyncio.to_thread(get_bedrock, ip, port, ip_type, refer, timeout),
+        )
+    )
 
 
 async def get_message_list(ip: str, port: int, timeout: int = 5) -> list[Text]:
@@ -156,29 +351,45 @@ async def get_message_list(ip: str, port: int, timeout: int = 5) -> list[Text]:
     """
     ip_groups = await get_origin_address(ip, port)
     messages = []
-    results = await asyncio.gather(
-        *(
-            get_mc(ip_group[0], ip_group[1], ip_group[2],
-               ip_group[3],
-               timeout)
-            for ip_group in ip_groups
+    results = []
+    tasks = [
+        asyncio.create_task(
+            get_mc(ip_group[0], ip_group[1], ip_group[2], ip_group[3], timeout)
         )
-    )
+        for ip_group in ip_groups
+    ]
+
+    # 按完成顺序处理，任一地址查询成功后即返回，不再等待其余地址超时
+    try:
+        for completed in asyncio.as_completed(tasks):
+            ms = await completed
+            results.append(ms)
+            # Java 与 Bedrock 同时在线时并发渲染，结果保持原有顺序
+            messages.extend(
+                await asyncio.gather(
+                    *(
+                        build_result(i[0], ip, message_type)
+                        for i in ms
+                        if i[0] is not None
+                    )
+                )
+            )
+            if messages:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
 
-    for ms in results:
-        for i in ms:
-            if i[0] is not None:
-                messages.append(await build_result(i[0], ip, message_type))
     if not messages:
         messages.append(
             next(
                 (
-                    Text(f"{lang_data[lang][str(item[1])]}")
+                    Text(current_strings[item[1].name])
                     for ms in results
                     for item in ms
-                    if item[1] != ConnStatus.CONNFAIL
+                    if item[1] is not ConnStatus.CONNFAIL
                 ),
-                Text(f"{lang_data[lang][str(ConnStatus.CONNFAIL)]}"),
+                Text(current_strings[ConnStatus.CONNFAIL.name]),
             )
         )
     return messages
@@ -201,18 +412,26 @@ def get_bedrock(
     - MineStat实例，包含服务器状态信息，如果服务器在线的话；否则可能返回None。
     """
     v6 = "IPv6" in ip_type
-    result = MineStat(host, port, timeout, SlpProtocols.BEDROCK_RAKNET, refer, v6)
+    try:
+        result = MineStat(host, port, timeout, SlpProtocols.BEDROCK_RAKNET, refer, v6)
+    except Exception:
+        # 响应解析异常时只影响基岩版的结果，不影响同时进行的Java版探测
+        logger.warning(
+            f"基岩版协议探测 {host}:{port} 时出错\n{traceback.format_exc()}"
+        )
+        return None, ConnStatus.UNKNOWN
 
     if result.online:
         return result, ConnStatus.SUCCESS
     return None, result.connection_status
 
 
-def get_java(
+async def get_java(
     host: str, port: int, ip_type: str, refer: str, timeout: int = 5
 ) -> tuple[MineStat | None, ConnStatus | None]:
     """
     异步函数，用于通过指定的主机名、端口和超时时间获取Minecraft Java版服务器状态。
+    各版本的 SLP 协议由旧到新依次探测，取信息最完整的成功结果。
 
     参数:
     - host: 服务器的主机名。
@@ -224,29 +443,85 @@ def get_java(
     返回:
     - MineStat 实例，包含服务器状态信息，如果服务器在线的话；否则可能返回 None。
     """
-    v6 = "IPv6" in ip_type
+    # 端口不可达时直接返回，不再为每个协议分别等待连接超时
+    if status := await _probe_tcp(host, port or MineStat.DEFAULT_TCP_PORT, timeout):
+        return None, status
+
+    # 部分旧版本服务器收到无法识别的数据包后会短暂停止响应，
+    # 各协议不能同时探测，整条探测链在同一个线程中依次执行
+    return await asyncio.to_thread(
+        _query_java, host, port, refer, timeout, "IPv6" in ip_type
+    )
+
 
-    # Minecraft 1.4 & 1.5 (legacy SLP)
-    result = MineStat(host, port, timeout, SlpProtocols.LEGACY, refer, v6)
+def _query_java(
+    host: str, port: int, refer: str, timeout: int, use_ipv6: bool
+) -> tuple[MineStat | None, ConnStatus | None]:
+    """
+    按 `_JAVA_PROTOCOLS` 的顺序依次探测Java版服务器。
 
-    # Minecraft Beta 1.8 to Release 1.3 (beta SLP)
-    if result.connection_status not in [ConnStatus.CONNFAIL, ConnStatus.SUCCESS]:
-        result = MineStat(host, port, timeout, SlpProtocols.BETA, refer, v6)
+    参数:
+    - host: 服务器的主机名。
+    - port: 服务器的端口号。
+    - refer: 服务器地址来源。
+    - timeout: 连接超时时间。
+    - use_ipv6: 是否使用IPv6连接。
 
-    # Minecraft 1.6 (extended legacy SLP)
-    if result.connection_status is not ConnStatus.CONNFAIL:
-        result = MineStat(host, port, timeout, SlpProtocols.EXTENDED_LEGACY, refer, v6)
+    返回:
+    - 最后一个成功协议的 MineStat 实例；均未成功时返回 None 及最后一次探测的连接状态，
+      所有协议都探测出错时为 `ConnStatus.UNKNOWN`（调用前端口已确认可达）。
+    """
+    best = None
+    status = None
+    for protocol in _JAVA_PROTOCOLS:
+        if status is ConnStatus.CONNFAIL:
+            break
+        # legacy SLP 已成功时不再尝试更旧的 beta SLP
+        if protocol is SlpProtocols.BETA and status is ConnStatus.SUCCESS:
+            continue
+        try:
+            result = MineStat(host, port, timeout, protocol, refer, use_ipv6)
+        except Exception:
+            # 某个协议解析异常时忽略该协议的结果，继续探测其余协议
+            logger.warning(
+                f"{protocol.name} 协议探测 {host}:{port} 时出错\n{traceback.format_exc()}"
+            )
+            continue
+        status = result.connection_status
+        if result.online:
+            best = result
 
-    # Minecraft 1.7+ (JSON SLP)
-    if result.connection_status is not ConnStatus.CONNFAIL:
-        result = MineStat(host, port, timeout, SlpProtocols.JSON, refer, v6)
+    if best is not None:
+        return best, ConnStatus.SUCCESS
+    return None, status or ConnStatus.UNKNOWN
 
-    if result.online:
-        return result, ConnStatus.SUCCESS
-    return None, result.connection_status
 
+async def _probe_tcp(host: str, port: int, timeout: int = 5) -> ConnStatus | None:
+    """
+    尝试与服务器建立一次 TCP 连接，判断端口是否可达。
+    连接超时不超过 `TCP_PROBE_TIMEOUT` 秒。
 
-async def parse_host(host_name) -> tuple[str, int]:
+    参数:
+    - host: 服务器的主机名。
+    - port: 服务器的端口号。
+    - timeout: 连接超时时间，默认为5秒。
+
+    返回:
+    - 端口可达时返回None，否则返回对应的连接状态。
+    """
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), min(timeout, TCP_PROBE_TIMEOUT)
+        )
+    except asyncio.TimeoutError:
+        return ConnStatus.TIMEOUT
+    except OSError:
+        return ConnStatus.CONNFAIL
+    writer.close()
+    return None
+
+
+def parse_host(host_name) -> tuple[str, int]:
     """
     解析主机名（可选端口）。
 
@@ -261,21 +536,18 @@ async def parse_host(host_name) -> tuple[str, int]:
     - 第一个元素是主机的IP地址（字符串形式）。
     - 第二个元素是主机的端口号（整数形式），如果主机名中未指定端口，则为0。
     """
-    pattern = r"(?:\[(.+?)\]|(.+?))(?:[:：](\d+))?$"
-    if not (match := re.match(pattern, host_name)):
+    if not (match := _HOST_RE.match(host_name)):
         return host_name, 0
 
-    address = match[1] or match[2]
-    port = int(match[3]) if match[3] else None
-
-    port = port if port is not None else 0
+    address = (match[1] or match[2]).rstrip(".")
+    port = int(match[3]) if match[3] else 0
 
     return address, port
 
 
-async def is_validity_address(address: str) -> bool:
+def is_validity_address(address: str) -> bool:
     """
-    异步判断给定的地址是否为有效的域名或IP地址。
+    判断给定的地址是否为有效的域名或IP地址。
 
     参数:
     address (str): 需要验证的地址，可以是域名地址或IP地址。
@@ -284,14 +556,10 @@ async def is_validity_address(address: str) -> bool:
     bool: 如果地址有效则返回True，否则返回False。
     """
 
-    return (
-        (await is_domain(address))
-        or (await is_ipv4(address))
-        or (await is_ipv6(address))
-    )
+    return get_ip_type(address) != "Unknown"
 
 
-async def is_domain(address: str) -> bool:
+def is_domain(address: str) -> bool:
     """
     判断给定的地址是否为域名。
 
@@ -303,17 +571,28 @@ async def is_domain(address: str) -> bool:
     """
     if address.lower() == "localhost":
         return True
-    domain_pattern = re.compile(
-        r"^(?!-)(?:[A-Za-z0-9-]{1,63}\.)+(?:[A-Za-z]{2,})$|^(xn--[A-Za-z0-9-]{1,63})\.[A-Za-z]{2,}$"
-    )
+    punycode_address = _idna_ascii(address)
+    return punycode_address is not None and bool(_DOMAIN_RE.match(punycode_address))
+
+
+@lru_cache(maxsize=1024)
+def _idna_ascii(address: str) -> str | None:
+    """
+    将域名编码为 punycode 形式，结果会被缓存。
+
+    参数:
+    address (str): 需要编码的域名。
+
+    返回:
+    str | None: 编码后的域名，无法编码时返回None。
+    """
     try:
-        punycode_address = idna.encode(address).decode("utf-8")
-        return bool(domain_pattern.match(punycode_address))
+        return idna.encode(address).decode("ascii")
     except idna.IDNAError:
-        return False
+        return None
 
 
-async def is_ipv4(address: str) -> bool:
+def is_ipv4(address: str) -> bool:
     """
     判断给定的地址是否为IPv4地址。
 
@@ -323,17 +602,14 @@ async def is_ipv4(address: str) -> bool:
     返回:
     bool: 如果地址为IPv4地址则返回True，否则返回False。
     """
-    ipv4_pattern = re.compile(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$")
-    match_ipv4 = ipv4_pattern.match(address)
-
-    if not match_ipv4:
+    try:
+        socket.inet_pton(socket.AF_INET, address)
+    except (OSError, ValueError):
         return False
+    return True
 
-    parts = address.split(".")
-    return not any(not part.isdigit() or not 0 <= int(part) <= 255 for part in parts)
 
-
-async def is_ipv6(address: str) -> bool:
+def is_ipv6(address: str) -> bool:
     """
     判断给定的地址是否为IPv6地址。
 
@@ -343,23 +619,90 @@ async def is_ipv6(address: str) -> bool:
     返回:
     bool: 如果地址为IPv6地址则返回True，否则返回False。
     """
-    ipv6_pattern = re.compile(
-        r"^\s*((([0-9A-Fa-f]{1,4}:){7}([0-9A-Fa-f]{1,4}|:))|(([0-9A-Fa-f]{1,4}:){6}(:[0-9A-Fa-f]{1,4}|((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3})|:))|(([0-9A-Fa-f]{1,4}:){5}(((:[0-9A-Fa-f]{1,4}){1,2})|:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3})|:))|(([0-9A-Fa-f]{1,4}:){4}(((:[0-9A-Fa-f]{1,4}){1,3})|((:[0-9A-Fa-f]{1,4})?:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:))|(([0-9A-Fa-f]{1,4}:){3}(((:[0-9A-Fa-f]{1,4}){1,4})|((:[0-9A-Fa-f]{1,4}){0,2}:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:))|(([0-9A-Fa-f]{1,4}:){2}(((:[0-9A-Fa-f]{1,4}){1,5})|((:[0-9A-Fa-f]{1,4}){0,3}:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:))|(([0-9A-Fa-f]{1,4}:){1}(((:[0-9A-Fa-f]{1,4}){1,6})|((:[0-9A-Fa-f]{1,4}){0,4}:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:))|(:(((:[0-9A-Fa-f]{1,4}){1,7})|((:[0-9A-Fa-f]{1,4}){0,5}:((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)(\.(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)){3}))|:)))(%.+)?\s*$"
-    )
-    match_ipv6 = ipv6_pattern.match(address)
-
-    return bool(match_ipv6)
+    # inet_pton 不接受作用域（如 `fe80::1%eth0`），仅校验地址部分
+    try:
+        socket.inet_pton(socket.AF_INET6, address.partition("%")[0])
+    except (OSError, ValueError):
+        return False
+    return True
 
 
-async def get_ip_type(address: str) -> str:
-    if not await is_validity_address(address):
-        return "Unknown"
-    if await is_ipv4(address):
-        return "IPv4"
-    elif await is_ipv6(address):
+def get_ip_type(address: str) -> str:
+    # 先用廉价的字符判断筛掉不可能的类型，每种校验最多执行一次
+    if ":" in address and is_ipv6(address):
         return "IPv6"
+    if address[:1].isdigit() and is_ipv4(address):
+        return "IPv4"
+    return "Domain" if is_domain(address) else "Unknown"
+
+
+def _get_resolver() -> dns.asyncresolver.Resolver:
+    """获取共享的 DNS 解析器，首次使用时创建，避免每次查询都重新读取系统 DNS 配置。"""
+    global _RESOLVER
+
+    if _RESOLVER is None:
+        _RESOLVER = dns.asyncresolver.Resolver()
+        # 单个服务器的等待时间与单条记录的总耗时都要有上限，
+        # 否则 DNS 服务器无响应时 SRV 与目标地址的解析会串行拖满外层超时
+        _RESOLVER.timeout = 2.0
+        _RESOLVER.lifetime = 4.0
+    return _RESOLVER
+
+
+def _cache_put(cache: dict, key, expiry: float, value) -> None:
+    """
+    写入一条带过期时间的解析缓存。
+    缓存已满时先清除过期条目，仍然已满则丢弃最早写入的条目。
+
+    参数:
+    - cache: `_SRV_CACHE` 或 `_ADDR_CACHE`。
+    - key: 缓存键。
+    - expiry: 过期时间（`time.monotonic()` 时间）。
+    - value: 缓存值。
+    """
+    # 重新写入的条目移到末尾，按写入顺序淘汰
+    cache.pop(key, None)
+    if len(cache) >= DNS_CACHE_MAX_SIZE:
+        now = time.monotonic()
+        for stale in [k for k, (deadline, _) in cache.items() if deadline <= now]:
+            del cache[stale]
+        while len(cache) >= DNS_CACHE_MAX_SIZE:
+            del cache[next(iter(cache))]
+    cache[key] = (expiry, value)
+
+
+async def _resolve_first(
+    resolver: dns.asyncresolver.Resolver, domain: str, rdtype: str
+) -> str | None:
+    """
+    解析域名的第一条 A 或 AAAA 记录，结果按记录 TTL 缓存。
+
+    参数:
+    - resolver: DNS 解析器。
+    - domain: 需要解析的域名。
+    - rdtype: 记录类型，"A" 或 "AAAA"。
+
+    返回:
+    - str | None: 解析出的地址，记录不存在或解析超时时返回None。
+    """
+    key = (domain, rdtype)
+    if (cached := _ADDR_CACHE.get(key)) and time.monotonic() < cached[0]:
+        return cached[1]
+    try:
+        response = await resolver.resolve(domain, rdtype)
+    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+        address, ttl = None, ADDR_NEGATIVE_TTL
+    except dns.exception.Timeout:
+        return None
     else:
-        return "Domain"
+        address = next((str(rdata.address) for rdata in response), None)
+        ttl = (
+            min(max(response.rrset.ttl, ADDR_CACHE_MIN_TTL), ADDR_CACHE_MAX_TTL)
+            if response.rrset is not None
+            else ADDR_CACHE_MIN_TTL
+        )
+    _cache_put(_ADDR_CACHE, key, time.monotonic() + ttl, address)
+    return address
 
 
 async def get_origin_address(
@@ -373,7 +716,7 @@ async def get_origin_address(
     参数:
     - address (str): 需要解析的地址。
     - ip_port (int): 适用于IPv4和IPv6地址的默认端口号。
-    - is_resolve_srv (bool): 师是否解析SRV，默认True
+    - is_resolve_srv (bool): 师是否解析SRV，默认True，配置 `disable_srv` 时始终不解析
 
     返回:
     - List[Tuple[str, int, str, str]]: 一个列表，包含一个元组，元组包含三个元素：
@@ -382,60 +725,164 @@ async def get_origin_address(
       - 第三个元素是地址的类型（"IPv4" 或 "IPv6" 或 "SRV" 或 "SRV-IPv4" 或 "SRV-IPv6"）。
       - 第四个元素是解析地址的来源域名或IP
     """
-    ip_type = await get_ip_type(domain)
+    ip_type = get_ip_type(domain)
     if ip_type != "Domain":
         return [(domain, ip_port, ip_type, domain)]
     data = []
 
-    resolver = dns.asyncresolver.Resolver()
-    resolver.timeout = 10
-    resolver.retries = 3
+    resolver = _get_resolver()
 
     async def resolve_srv():
-        with contextlib.suppress(
-            dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout
-        ):
-            srv_response = await resolver.resolve(f"_minecraft._tcp.{domain}", "SRV")
-            for rdata in srv_response:
-                srv_address = str(rdata.target).rstrip(".")
-                srv_port = rdata.port
-                ip_type = await get_ip_type(srv_address)
-                if ip_type == "Domain":
-                    srv_address_ = await get_origin_address(srv_address, srv_port, False)
-                    data.extend([(srv_address_[0][0], srv_address_[0][1], f"SRV-{srv_address_[0][2]}", srv_address_[0][3])])
-                    #data.extend([(addr, port, f"SRV-{ip_type}", refer) for addr, port, ip_type, refer in srv_address_])
-                else:
-                    data.append((srv_address, srv_port, "SRV", domain))
-                break
+        if (cached := _SRV_CACHE.get(domain)) and time.monotonic() < cached[0]:
+            if cached[1] is None:
+                return
+            srv_address, srv_port = cached[1]
+            expiry = None
+        else:
+            try:
+                srv_response = await resolver.resolve(
+                    f"_minecraft._tcp.{domain}", "SRV"
+                )
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+                _cache_put(
+                    _SRV_CACHE, domain, time.monotonic() + SRV_NEGATIVE_TTL, None
+                )
+                return
+            except dns.exception.Timeout:
+                return
+            rdata = next(iter(srv_response), None)
+            if rdata is None:
+                return
+            srv_address = str(rdata.target).rstrip(".")
+            srv_port = rdata.port
+            expiry = time.monotonic() + (
+                min(srv_response.rrset.ttl, SRV_CACHE_MAX_TTL)
+                if srv_response.rrset is not None
+                else SRV_CACHE_TTL
+            )
+
+        # 只缓存 SRV 记录本身，目标地址每次经 `_resolve_first` 按其自身的 TTL 解析
+        srv_data = []
+        if get_ip_type(srv_address) == "Domain":
+            # 同时解析 SRV 目标的 A 与 AAAA 记录
+            ipv4, ipv6 = await asyncio.gather(
+                _resolve_first(resolver, srv_address, "A"),
+                _resolve_first(resolver, srv_address, "AAAA"),
+            )
+            if ipv4:
+                srv_data.append((ipv4, srv_port, "SRV-IPv4", srv_address))
+            if ipv6:
+                srv_data.append((ipv6, srv_port, "SRV-IPv6", srv_address))
+        else:
+            srv_data.append((srv_address, srv_port, "SRV", domain))
+
+        # 目标地址未能解析时不缓存，下次查询重新获取 SRV 记录
+        if expiry is not None and srv_data:
+            _cache_put(_SRV_CACHE, domain, expiry, (srv_address, srv_port))
+        data.extend(srv_data)
 
     async def resolve_aaaa():
-        with contextlib.suppress(
-            dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout
-        ):
-            response = await resolver.resolve(domain, "AAAA")
-            for rdata in response:
-                data.append((str(rdata.address), ip_port, "IPv6", domain))
-                break
+        if address := await _resolve_first(resolver, domain, "AAAA"):
+            data.append((address, ip_port, "IPv6", domain))
 
     async def resolve_a():
-        with contextlib.suppress(
-            dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout
-        ):
-            response = await resolver.resolve(domain, "A")
-            for rdata in response:
-                data.append((str(rdata.address), ip_port, "IPv4", domain))
-                break
+        if address := await _resolve_first(resolver, domain, "A"):
+            data.append((address, ip_port, "IPv4", domain))
+
+    if is_resolve_srv and not disable_srv:
+        lookups = asyncio.gather(resolve_srv(), resolve_aaaa(), resolve_a())
+    else:
+        lookups = asyncio.gather(resolve_aaaa(), resolve_a())
+
+    # 超时后保留已解析出的记录，未完成的查询会被取消
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(lookups, RESOLVE_TIMEOUT)
+
+    # SRV 目标与域名本身解析到同一地址和端口时只保留一条
+    unique = {}
+    for item in data:
+        unique.setdefault((item[0], item[1]), item)
+    return list(unique.values())
+
+
+def _parse_json_motd(extra, parts: list[str]) -> None:
+    """
+    将 JSON 格式的 MOTD（聊天组件）转换为 HTML 片段，追加到 `parts`。
 
-    if is_resolve_srv:
-        await asyncio.gather(resolve_srv(), resolve_aaaa(), resolve_a())
+    参数:
+    - extra: 聊天组件，可以是字典、列表或纯文本。
+    - parts (list[str]): 用于收集 HTML 片段的列表。
+    """
+    if isinstance(extra, dict) and "extra" in extra:
+        for key in extra:
+            if key == "extra":
+                _parse_json_motd(extra[key], parts)
+            elif key == "text":
+                _parse_json_motd(extra[key], parts)
+    elif isinstance(extra, dict):
+        color = extra.get("color", "")
+        text = extra.get("text", "")
+
+        # 将颜色转换为 HTML 的 font 标签
+        if color.startswith("#"):
+            hex_color = color[1:]
+            if len(hex_color) == 3:
+                hex_color = "".join([c * 2 for c in hex_color])
+            color_code = hex_color.upper()
+            color_html_str = (f'<span style="color:#{color_code};">', "</span>")
+        else:
+            color_html_str = _COLOR_MAP.get(color, ("", ""))
+            color_code = _TAG_COLOR_RE.search(color_html_str[0])
+            color_code = color_code[1] if color_code else "#FFFFFF"
+        open_tag, close_tag = color_html_str
+        for style, (open_tag_, close_tag_) in _STYLE_TAGS:
+            if extra.get(style) is True:
+                open_tag += open_tag_.format(color_code)
+                close_tag = close_tag_ + close_tag
+        parts += (open_tag, text, close_tag)
+    elif isinstance(extra, list):
+        for item in extra:
+            _parse_json_motd(item, parts)
     else:
-        await asyncio.gather(resolve_aaaa(), resolve_a())
+        parts.append(str(extra))
+
+
+def _parse_text_motd(text: str, parts: list[str]) -> None:
+    """
+    将带有样式代码（`§`）的纯文本 MOTD 转换为 HTML 片段，追加到 `parts`。
+
+    参数:
+    - text (str): MOTD 文本。
+    - parts (list[str]): 用于收集 HTML 片段的列表。
+    """
+    last = 0
+    styles = []
+    for match in _STYLE_CODE_RE.finditer(text):
+        if (tags := _COLOR_MAP.get(match[0])) is None:
+            continue
+        parts.append(text[last : match.start()])
+        last = match.end()
+        open_tag, close_tag = tags
+
+        # 如果是重置，则清空样式栈
+        if open_tag == "</b></i></u></s>":
+            # 清空样式栈并关闭所有打开的样式
+            parts += styles
+            styles.clear()
+        else:
+            styles.append(close_tag)
+            parts.append(open_tag)
+    parts.append(text[last:])
+
+    # 在字符串末尾关闭所有打开的样式
+    parts += styles
 
-    return data
 
-async def parse_motd2html(json_data: str | None) -> str | None:
+@lru_cache(maxsize=512)
+def parse_motd2html(json_data: str | None) -> str | None:
     """
     解析MOTD数据并转换为带有自定义颜色的HTML字符串。
+    同一服务器的 MOTD 很少变化，结果会被缓存。
 
     参数:
     - json_data (str|None): MOTD数据。
@@ -446,148 +893,17 @@ async def parse_motd2html(json_data: str | None) -> str | None:
     if json_data is None:
         return None
 
-    standard_color_map = {
-        "black": ('<span style="color:#000000;">', "</span>"),
-        "dark_blue": ('<span style="color:#0000AA;">', "</span>"),
-        "dark_green": ('<span style="color:#00AA00;">', "</span>"),
-        "dark_aqua": ('<span style="color:#00AAAA;">', "</span>"),
-        "dark_red": ('<span style="color:#AA0000;">', "</span>"),
-        "dark_purple": ('<span style="color:#AA00AA;">', "</span>"),
-        "gold": ('<span style="color:#FFAA00;">', "</span>"),
-        "gray": ('<span style="color:#AAAAAA;">', "</span>"),
-        "dark_gray": ('<span style="color:#555555;">', "</span>"),
-        "blue": ('<span style="color:#0000FF;">', "</span>"),
-        "green": ('<span style="color:#00AA00;">', "</span>"),
-        "aqua": ('<span style="color:#00AAAA;">', "</span>"),
-        "red": ('<span style="color:#AA0000;">', "</span>"),
-        "light_purple": ('<span style="color:#FFAAFF;">', "</span>"),
-        "yellow": ('<span style="color:#FFFF00;">', "</span>"),
-        "white": ('<span style="color:#FFFFFF;">', "</span>"),
-        "reset": ("</b></i></u></s>", ""),
-        "bold": ("<b style='color: {};'>", "</b>"),
-        "italic": ("<i style='color: {};'>", "</i>"),
-        "underline": ("<u style='color: {};'>", "</u>"),
-        "strikethrough": ("<s style='color: {};'>", "</s>"),
-        "§0": ('<span style="color:#000000;">', "</span>"),  # black
-        "§1": ('<span style="color:#0000AA;">', "</span>"),  # dark blue
-        "§2": ('<span style="color:#00AA00;">', "</span>"),  # dark green
-        "§3": ('<span style="color:#00AAAA;">', "</span>"),  # dark aqua
-        "§4": ('<span style="color:#AA0000;">', "</span>"),  # dark red
-        "§5": ('<span style="color:#AA00AA;">', "</span>"),  # dark purple
-        "§6": ('<span style="color:#FFAA00;">', "</span>"),  # gold
-        "§7": ('<span style="color:#AAAAAA;">', "</span>"),  # gray
-        "§8": ('<span style="color:#555555;">', "</span>"),  # dark gray
-        "§9": ('<span style="color:#0000FF;">', "</span>"),  # blue
-        "§a": ('<span style="color:#00AA00;">', "</span>"),  # green
-        "§b": ('<span style="color:#00AAAA;">', "</span>"),  # aqua
-        "§c": ('<span style="color:#AA0000;">', "</span>"),  # red
-        "§d": ('<span style="color:#FFAAFF;">', "</span>"),  # light purple
-        "§e": ('<span style="color:#FFFF00;">', "</span>"),  # yellow
-        "§f": ('<span style="color:#FFFFFF;">', "</span>"),  # white
-        "§g": ('<span style="color:#DDD605;">', "</span>"),  # minecoin gold
-        "§h": ('<span style="color:#E3D4D1;">', "</span>"),  # material quartz
-        "§i": ('<span style="color:#CECACA;">', "</span>"),  # material iron
-        # material netherite
-        "§j": ('<span style="color:#443A3B;">', "</span>"),
-        "§l": ("<b style='color: {};'>", "</b>"),  # bold
-        "§m": ("<s style='color: {};'>", "</s>"),  # strikethrough
-        "§n": ("<u style='color: {};'>", "</u>"),  # underline
-        "§o": ("<i style='color: {};'>", "</i>"),  # italic
-        "§p": ('<span style="color:#DEB12D;">', "</span>"),  # material gold
-        "§q": ('<span style="color:#47A036;">', "</span>"),  # material emerald
-        "§r": ("</b></i></u></s>", ""),  # reset
-        "§s": ('<span style="color:#2CBAA8;">', "</span>"),  # material diamond
-        "§t": ('<span style="color:#21497B;">', "</span>"),  # material lapis
-        "§u": ('<span style="color:#9A5CC6;">', "</span>"),  # material amethyst
-    }
-
-    async def parse_extra(extra, styles=[]):
-        result = ""
-        if isinstance(extra, dict) and "extra" in extra:
-            for key in extra:
-                if key == "extra":
-                    result += await parse_extra(extra[key], styles)
-                elif key == "text":
-                    result += await parse_extra(extra[key], styles)
-        elif isinstance(extra, dict):
-            color = extra.get("color", "")
-            text = extra.get("text", "")
-
-            # 将颜色转换为 HTML 的 font 标签
-            if color.startswith("#"):
-                hex_color = color[1:]
-                if len(hex_color) == 3:
-                    hex_color = "".join([c * 2 for c in hex_color])
-                color_code = hex_color.upper()
-                color_html_str = (f'<span style="color:#{color_code};">', "</span>")
-            else:
-                color_html_str = standard_color_map.get(color, ("", ""))
-                color_code = re.search(
-                    r"color:\s*#([0-9A-Fa-f]{6});", color_html_str[0]
-                )
-                color_code = color_code[1] if color_code else "#FFFFFF"
-            # 更新样式栈
-            open_tag, close_tag = color_html_str
-            if extra.get("bold") is True:
-                open_tag_, close_tag_ = standard_color_map["bold"]
-                open_tag += open_tag_.format(color_code)
-                close_tag = close_tag_ + close_tag
-            if extra.get("italic") is True:
-                open_tag_, close_tag_ = standard_color_map["italic"]
-                open_tag += open_tag_.format(color_code)
-                close_tag = close_tag_ + close_tag
-            if extra.get("underline") is True:
-                open_tag_, close_tag_ = standard_color_map["underline"]
-                open_tag += open_tag_.format(color_code)
-                close_tag = close_tag_ + close_tag
-            if extra.get("strikethrough") is True:
-                open_tag_, close_tag_ = standard_color_map["strikethrough"]
-                open_tag += open_tag_.format(color_code)
-                close_tag = close_tag_ + close_tag
-            styles.append(close_tag)
-            result += open_tag + text + close_tag
-        elif isinstance(extra, list):
-            for item in extra:
-                result += await parse_extra(item, styles)
-        else:
-            result += str(extra)
-        return result.replace("\n", "<br>")
+    # 不含样式代码、也不像 JSON 的纯文本无需解析
+    if "§" not in json_data and not json_data.lstrip().startswith(("{", "[", '"')):
+        return json_data.replace("\n", "<br>")
 
+    parts = []
     try:
-        json_data = ujson.loads(json_data)
-    except ujson.JSONDecodeError:
-        result = ""
-        i = 0
-        styles = []
-        while i < len(json_data):
-            if json_data[i] == "§":
-                style_code = json_data[i : i + 2]
-                if style_code in standard_color_map:
-                    open_tag, close_tag = standard_color_map[style_code]
-
-                    # 如果是重置，则清空样式栈
-                    if open_tag == "</b></i></u></s>":
-                        # 清空样式栈并关闭所有打开的样式
-                        for tag in styles:
-                            result += tag
-                        styles.clear()
-                    else:
-                        styles.append(close_tag)
-                        result += open_tag
-                    i += 2
-                    continue
-            # 处理换行符
-            if json_data[i : i + 2] == "\n":
-                result += "<br>"
-                i += 2
-                continue
-            result += json_data[i]
-            i += 1
-
-        # 在字符串末尾关闭所有打开的样式
-        for tag in styles:
-            result += tag
-
-        return result
-
-    return await parse_extra(json_data)
+        motd = _json_loads(json_data)
+    except JSONDecodeError:
+        _parse_text_motd(json_data, parts)
+    else:
+        _parse_json_motd(motd, parts)
+
+    # 处理换行符
+    return "".join(parts).replace("\n", "<br>")